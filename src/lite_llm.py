@@ -3,11 +3,199 @@ This module provides a unified interface for interacting with various LLM provid
 through the LiteLLM framework, maintaining compatibility with the OpenAI API.
 """
 
+import asyncio
+import hashlib
 import os
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
+import httpx
+import numpy as np
 import openai  # type: ignore
-from litellm import completion, completion_cost  # type: ignore
+import orjson
+from litellm import acompletion, completion, completion_cost, get_llm_provider  # type: ignore
+
+# Batching of streamed output: start with single tokens so the first words appear
+# immediately, then grow the batch to cut per-write overhead on long responses.
+DEFAULT_MIN_BATCH_SIZE = 1
+DEFAULT_MAX_BATCH_SIZE = 50
+BATCH_GROWTH_FACTOR = 3
+STREAM_FLUSH_INTERVAL = 0.05  # seconds
+
+# Keep-alive pool shared by the requests of one client instance
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+QUANT_SCALE = 127  # int8 scale for normalized semantic-cache embeddings
+
+# Stable key order for hashing; non-str keys (e.g. logit_bias token ids) are stringified instead of raising
+CACHE_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+PARAPHRASE_PROMPT = (
+    "Rewrite the following request in {n} different ways a user might phrase it. "
+    "Reply with a JSON array of strings only.\n\n{text}"
+)
+
+
+def print_stream(
+    chunks: Iterable[str],
+    min_batch_size: int = DEFAULT_MIN_BATCH_SIZE,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    flush_interval: float = STREAM_FLUSH_INTERVAL,
+) -> str:
+    """Print streamed text in growing batches instead of one write per chunk.
+
+    A batch is written when it reaches the current batch size or when
+    ``flush_interval`` seconds have passed since the last write.
+
+    Args:
+        chunks: The streamed text chunks, e.g. from ``LiteLLMClient.stream_chat_completion``
+        min_batch_size: Number of chunks in the first batch
+        max_batch_size: Upper bound on the number of chunks per batch
+        flush_interval: Maximum seconds to hold chunks before writing them
+
+    Returns:
+        The full streamed text
+    """
+    parts: List[str] = []
+    buf: List[str] = []
+    batch_size = min_batch_size
+    last_flush = time.monotonic()
+    for chunk in chunks:
+        buf.append(chunk)
+        if len(buf) >= batch_size or time.monotonic() - last_flush > flush_interval:
+            text = "".join(buf)
+            print(text, end="", flush=True)
+            parts.append(text)
+            buf.clear()
+            batch_size = min(batch_size * BATCH_GROWTH_FACTOR, max_batch_size)
+            last_flush = time.monotonic()
+    if buf:
+        text = "".join(buf)
+        print(text, end="", flush=True)
+        parts.append(text)
+    return "".join(parts)
+
+
+class SemanticCache:
+    """An in-memory cache that returns stored responses for semantically similar prompts.
+
+    Prompts are embedded with a sentence-transformers model and compared by cosine
+    similarity. Entries are grouped into clusters: a lookup first picks the cluster
+    whose centroid is closest to the query and then only scans that cluster, so the
+    work per lookup grows with the cluster size rather than the whole cache.
+    Embeddings are L2-normalized on insert, so every comparison is a plain dot product.
+    Entries live in separate scopes, so a prompt only matches responses that were produced
+    with the same model and request parameters.
+
+    Member embeddings are stored as float32 by default. ``quantize=True`` stores them as
+    int8, a quarter of the size, for long-lived caches where resident memory matters more
+    than latency: the int8 rows are widened to float32 for every lookup, so scoring a large
+    cluster is roughly 3x slower (about 5 ms vs 1.5 ms for 20k x 384) and the temporary
+    float32 copy means peak memory during a lookup is not lower.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.9,
+        cluster_threshold: float = 0.8,
+        quantize: bool = False,
+    ):
+        """Initialize the semantic cache.
+
+        Args:
+            model_name: The sentence-transformers model used to embed prompts
+            threshold: Minimum cosine similarity for a stored response to be returned
+            cluster_threshold: Minimum similarity to a centroid for a new entry to join that cluster
+            quantize: Store member embeddings as int8 (less memory) instead of float32 (faster lookup)
+        """
+        from sentence_transformers import SentenceTransformer  # type: ignore
+
+        self.encoder = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.cluster_threshold = cluster_threshold
+        self.quantized = quantize
+        # Entries are partitioned by scope (the request parameters they were produced with), and
+        # each scope holds "clusters" ({"centroid", "sum", "embs", "responses"}) and "centroids"
+        # (normalized centroids, one row per cluster)
+        self.scopes: Dict[str, Dict[str, Any]] = {}
+        # Clusters and centroid rows are updated together; batch_chat_completion calls in from worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def messages_to_text(messages: List[Dict[str, str]]) -> str:
+        """Flatten a message list into the string that gets embedded."""
+        return "\n".join(f"{m.get('role', '')}: {m.get('content', '')}" for m in messages)
+
+    def encode(self, text: str) -> np.ndarray:
+        """Embed a prompt and L2-normalize the result."""
+        emb = np.asarray(self.encoder.encode(text), dtype=np.float32)
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm else emb
+
+    @staticmethod
+    def quantize(emb: np.ndarray) -> np.ndarray:
+        """Quantize a normalized embedding to int8, scaling [-1, 1] to [-127, 127]."""
+        return np.round(emb * QUANT_SCALE).astype(np.int8)
+
+    def _stored(self, emb: np.ndarray) -> np.ndarray:
+        """Return the form in which a member embedding is stored."""
+        return self.quantize(emb) if self.quantized else emb
+
+    @staticmethod
+    def _nearest_cluster(partition: Dict[str, Any], emb: np.ndarray) -> Tuple[int, float]:
+        """Return the index of the closest cluster and its centroid similarity, or (-1, -1.0) if empty."""
+        if partition["centroids"] is None:
+            return -1, -1.0
+        scores = partition["centroids"] @ emb
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+    def lookup(self, emb: np.ndarray, scope: str = "") -> Optional[Any]:
+        """Return the cached response closest to ``emb`` in ``scope`` if it clears the threshold."""
+        with self._lock:
+            partition = self.scopes.get(scope)
+            if partition is None:
+                return None
+            cid, _ = self._nearest_cluster(partition, emb)
+            if cid < 0:
+                return None
+            cluster = partition["clusters"][cid]
+            embs, responses = cluster["embs"], cluster["responses"]
+        if self.quantized:
+            # Widen to float32 so the product runs through BLAS; an int8 matmul would overflow
+            # and NumPy's integer matmul is slower still
+            scores = embs.astype(np.float32) @ self.quantize(emb).astype(np.float32) / QUANT_SCALE**2
+        else:
+            scores = embs @ emb
+        best = int(np.argmax(scores))
+        return responses[best] if scores[best] >= self.threshold else None
+
+    def add(self, emb: np.ndarray, response: Any, scope: str = "") -> None:
+        """Store a response under an already-normalized prompt embedding in ``scope``."""
+        with self._lock:
+            partition = self.scopes.setdefault(scope, {"clusters": [], "centroids": None})
+            cid, score = self._nearest_cluster(partition, emb)
+            if cid >= 0 and score > self.cluster_threshold:
+                cluster = partition["clusters"][cid]
+                cluster["embs"] = np.vstack([cluster["embs"], self._stored(emb)])
+                cluster["responses"].append(response)
+                # Running mean of the members, re-normalized for cosine comparisons
+                cluster["sum"] = cluster["sum"] + emb
+                norm = np.linalg.norm(cluster["sum"])
+                cluster["centroid"] = cluster["sum"] / norm if norm else cluster["sum"]
+                partition["centroids"][cid] = cluster["centroid"]
+                return
+            partition["clusters"].append(
+                {"centroid": emb, "sum": emb.copy(), "embs": self._stored(emb)[np.newaxis, :], "responses": [response]}
+            )
+            centroids = partition["centroids"]
+            # Copy the first row: centroid rows are updated in place and must not alias the member embedding
+            partition["centroids"] = emb[np.newaxis, :].copy() if centroids is None else np.vstack([centroids, emb])
 
 
 class LiteLLMClient:
@@ -15,8 +203,38 @@ class LiteLLMClient:
 
     This class provides a unified interface that's compatible with the OpenAI API,
     making it easy to switch between different LLM providers without changing your code.
+
+    Async calls use a connection pool bound to the running event loop. Close it before the
+    loop ends, either with ``await client.aclose()`` or by using the client as an async
+    context manager inside each ``asyncio.run``::
+
+        async def main():
+            async with LiteLLMClient(model="gpt-4o-mini") as client:
+                return await client.abatch(list_of_messages)
+
+        asyncio.run(main())
     """
 
+    __slots__ = (
+        "model",
+        "api_base",
+        "api_key",
+        "timeout",
+        "max_retries",
+        "temperature",
+        "semantic_cache",
+        "prefetch_variants",
+        "kwargs",
+        "_exact_cache",
+        "_exact_cache_lock",
+        "_prefetch_semaphores",
+        "_prefetch_tasks",
+        "_http_client",
+        "_async_openai_clients",
+        "_openai_client",
+        "_model_info",
+    )
+
     def __init__(
         self,
         model: str = "gpt-3.5-turbo",
@@ -25,6 +243,8 @@ class LiteLLMClient:
         timeout: float = 10.0,
         max_retries: int = 2,
         temperature: float = 0.7,
+        semantic_cache: Optional[SemanticCache] = None,
+        prefetch_variants: int = 0,
         **kwargs,
     ):
         """Initialize the LiteLLM client.
@@ -36,6 +256,10 @@ class LiteLLMClient:
             timeout: Timeout in seconds for API requests
             max_retries: Maximum number of retries for failed requests
             temperature: Temperature setting for the model
+            semantic_cache: Optional cache consulted before non-streaming completions
+            prefetch_variants: Number of paraphrases of each async cache miss to answer in the
+                background and store in the semantic cache (0 disables prefetching). ``aclose``
+                (or ``async with``) waits for prefetches still running
             **kwargs: Additional keyword arguments to pass to the LiteLLM client
         """
         self.model = model
@@ -44,7 +268,15 @@ class LiteLLMClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.temperature = temperature
+        self.semantic_cache = semantic_cache
+        self._exact_cache: Dict[str, Any] = {}  # Responses for deterministic (temperature=0) calls
+        self._exact_cache_lock = threading.Lock()
+        self.prefetch_variants = prefetch_variants
+        # Caps concurrent prefetch calls; one semaphore per event loop, created on first use
+        self._prefetch_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._prefetch_tasks: set = set()  # Strong references so background tasks are not collected
         self.kwargs = kwargs  # Store kwargs as an instance variable
+        self._model_info: Optional[Mapping[str, Any]] = None  # Built lazily by get_model_info
 
         # Set default API key if not provided
         if not self.api_key and "openai" in model.lower():
@@ -54,6 +286,143 @@ class LiteLLMClient:
         openai.api_base = self.api_base or "https://api.openai.com/v1"
         openai.api_key = self.api_key or ""
 
+        # Share pooled keep-alive HTTP/2 connections across calls instead of paying
+        # TCP + TLS setup on every request. Async pools are bound to the event loop
+        # that created them, so they are created lazily, one per running loop.
+        self._http_client = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=self.timeout)
+        self._async_openai_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # Native OpenAI client used for the fallback path and batch jobs, sharing the same
+        # pool. Created on first use: without an API key the SDK reads OPENAI_API_KEY itself
+        # and raises if that is unset too, which must not break clients for other providers.
+        self._openai_client: Optional[openai.OpenAI] = None
+
+    def _uses_openai_client(self) -> bool:
+        """Whether LiteLLM routes the current model through the OpenAI SDK, which accepts a pooled client."""
+        try:
+            return get_llm_provider(self.model)[1] == "openai"
+        except Exception:
+            return False
+
+    def _sync_openai_client(self) -> openai.OpenAI:
+        """Return the pooled OpenAI client, creating it on first use."""
+        if self._openai_client is None:
+            self._openai_client = openai.OpenAI(
+                api_key=self.api_key,
+                base_url=self.api_base,
+                max_retries=self.max_retries,
+                http_client=self._http_client,
+            )
+        return self._openai_client
+
+    def _async_openai_client(self) -> openai.AsyncOpenAI:
+        """Return the pooled async OpenAI client for the running event loop, creating it on first use.
+
+        The pool is only released by ``aclose()`` on the same loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_openai_clients.get(loop)
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.api_base,
+                max_retries=self.max_retries,
+                http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=self.timeout),
+            )
+            self._async_openai_clients[loop] = client
+        return client
+
+    def _completion_params(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool = False,
+        client_factory: Optional[Callable[[], Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Build the keyword arguments shared by the sync and async completion calls.
+
+        The client returned by ``client_factory`` is passed to LiteLLM as ``client`` when the
+        model goes through the OpenAI SDK and the caller did not supply a client of their own.
+        """
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "api_base": self.api_base,
+            "api_key": self.api_key,
+            "timeout": self.timeout,
+            "max_retries": self.max_retries,
+            "temperature": self.temperature,
+            "stream": stream,
+            **kwargs,
+        }
+        if client_factory is not None and "client" not in params and self._uses_openai_client():
+            params["client"] = client_factory()
+        return params
+
+    @staticmethod
+    def _attach_cost(response: Any) -> Any:
+        """Attach the cost of a completion to the response, if it can be computed."""
+        # Calculate cost if available (local price-table lookup from response.usage)
+        if hasattr(response, "usage"):
+            try:
+                response.cost = completion_cost(completion_response=response)
+            except Exception:
+                # Some models have no pricing table entry
+                response.cost = None
+        return response
+
+    def _request_scope(self, **kwargs) -> str:
+        """Hash every request parameter other than the messages that can change the answer.
+
+        Both caches only reuse responses produced under the same scope.
+        """
+        payload = {
+            "model": self.model,
+            "api_base": self.api_base,
+            "kwargs": {**kwargs, "temperature": kwargs.get("temperature", self.temperature)},
+        }
+        return hashlib.sha256(orjson.dumps(payload, default=str, option=CACHE_KEY_OPTIONS)).hexdigest()
+
+    def _exact_cache_key(self, messages: List[Dict[str, str]], stream: bool, scope: str, **kwargs) -> Optional[str]:
+        """Return the exact-match cache key for a deterministic call, or None if it should not be cached."""
+        if stream or kwargs.get("temperature", self.temperature) != 0:
+            return None
+        payload = {"scope": scope, "messages": messages}
+        return hashlib.sha256(orjson.dumps(payload, default=str, option=CACHE_KEY_OPTIONS)).hexdigest()
+
+    def _semantic_lookup(
+        self, messages: List[Dict[str, str]], stream: bool, scope: str
+    ) -> Tuple[Optional[np.ndarray], Optional[Any]]:
+        """Embed the prompt and consult the semantic cache, if one is configured.
+
+        Returns:
+            The prompt embedding (None when caching does not apply) and the cached response, if any
+        """
+        if self.semantic_cache is None or stream:
+            return None, None
+        emb = self.semantic_cache.encode(self.semantic_cache.messages_to_text(messages))
+        return emb, self.semantic_cache.lookup(emb, scope)
+
+    def _fallback_params(self, messages: List[Dict[str, str]], stream: bool, **kwargs) -> Optional[Dict[str, Any]]:
+        """Return the arguments for the native OpenAI fallback, or None if the model has no fallback."""
+        if "openai" not in self.model.lower():
+            return None
+        return {"model": self.model, "messages": messages, "temperature": self.temperature, "stream": stream, **kwargs}
+
+    def _failure_error(self, error: Exception, fallback_error: Optional[Exception] = None) -> RuntimeError:
+        """Build the error raised when LiteLLM (and the fallback, if it ran) failed."""
+        if fallback_error is None:
+            return RuntimeError(f"LiteLLM failed for model {self.model}: {str(error)}")
+        return RuntimeError(f"LiteLLM failed: {str(error)}. OpenAI fallback also failed: {str(fallback_error)}")
+
+    def _cache_response(self, key: Optional[str], emb: Optional[np.ndarray], scope: str, response: Any) -> None:
+        """Store a fresh response in the exact-match and semantic caches that apply to it."""
+        if key is not None:
+            with self._exact_cache_lock:
+                self._exact_cache[key] = response
+        if emb is not None:
+            self.semantic_cache.add(emb, response, scope)
+
     def chat_completion(
         self, messages: List[Dict[str, str]], stream: bool = False, **kwargs
     ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
@@ -67,64 +436,308 @@ class LiteLLMClient:
         Returns:
             The completion result from LiteLLM or OpenAI
         """
+        scope = self._request_scope(**kwargs)
+        key = self._exact_cache_key(messages, stream, scope, **kwargs)
+        if key is not None and key in self._exact_cache:
+            return self._exact_cache[key]
+        emb, cached = self._semantic_lookup(messages, stream, scope)
+        if cached is not None:
+            return cached
+
         try:
             # Use LiteLLM's completion function which supports multiple providers
             response = completion(
-                model=self.model,
-                messages=messages,
-                api_base=self.api_base,
-                api_key=self.api_key,
-                timeout=self.timeout,
-                max_retries=self.max_retries,
-                temperature=self.temperature,
-                stream=stream,
-                **kwargs,
+                **self._completion_params(messages, stream, client_factory=self._sync_openai_client, **kwargs)
             )
+            response = self._attach_cost(response)
+        except Exception as e:
+            # Fall back to OpenAI's native implementation if applicable
+            fallback = self._fallback_params(messages, stream, **kwargs)
+            if fallback is None:
+                raise self._failure_error(e) from e
+            try:
+                return self._sync_openai_client().chat.completions.create(**fallback)
+            except Exception as e2:
+                raise self._failure_error(e, e2) from e2
+        self._cache_response(key, emb, scope, response)
+        return response
 
-            # Calculate cost if available
-            if hasattr(response, "usage"):
-                response.cost = completion_cost(
-                    model=self.model,
-                    messages=messages,
-                    api_base=self.api_base,
-                    api_key=self.api_key,
-                    timeout=self.timeout,
-                    max_retries=self.max_retries,
-                    temperature=self.temperature,
-                    stream=stream,
-                    **kwargs,
-                )
+    def stream_chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Stream a response, yielding each content delta as soon as it arrives.
 
-            return response
+        Args:
+            messages: A list of message dictionaries with 'role' and 'content'
+            **kwargs: Additional arguments to pass to the completion function
 
+        Yields:
+            The text of each streamed chunk
+        """
+        try:
+            response = completion(
+                **self._completion_params(messages, stream=True, client_factory=self._sync_openai_client, **kwargs)
+            )
+        except Exception as e:
+            raise RuntimeError(f"LiteLLM failed for model {self.model}: {str(e)}") from e
+        for chunk in response:
+            yield chunk.choices[0].delta.content or ""
+
+    async def achat_completion(
+        self, messages: List[Dict[str, str]], stream: bool = False, prefetch: bool = True, **kwargs
+    ) -> Any:
+        """Asynchronously generate a response using the specified model.
+
+        Args:
+            messages: A list of message dictionaries with 'role' and 'content'
+            stream: Whether to use streaming mode
+            prefetch: Whether a semantic cache miss may schedule background paraphrase prefetching
+            **kwargs: Additional arguments to pass to the completion function
+
+        Returns:
+            The completion result from LiteLLM or OpenAI
+        """
+        scope = self._request_scope(**kwargs)
+        key = self._exact_cache_key(messages, stream, scope, **kwargs)
+        if key is not None and key in self._exact_cache:
+            return self._exact_cache[key]
+        # Embedding is CPU-bound; run it off the event loop so concurrent calls overlap
+        emb, cached = await asyncio.to_thread(self._semantic_lookup, messages, stream, scope)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await acompletion(
+                **self._completion_params(messages, stream, client_factory=self._async_openai_client, **kwargs)
+            )
+            response = self._attach_cost(response)
         except Exception as e:
             # Fall back to OpenAI's native implementation if applicable
-            if "openai" in self.model.lower():
+            fallback = self._fallback_params(messages, stream, **kwargs)
+            if fallback is None:
+                raise self._failure_error(e) from e
+            try:
+                return await self._async_openai_client().chat.completions.create(**fallback)
+            except Exception as e2:
+                raise self._failure_error(e, e2) from e2
+        self._cache_response(key, emb, scope, response)
+        if emb is not None and prefetch and self.prefetch_variants > 0:
+            task = asyncio.create_task(self._prefetch_paraphrases(messages, **kwargs))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+        return response
+
+    async def _prefetch_paraphrases(self, messages: List[Dict[str, str]], **kwargs) -> None:
+        """Answer paraphrases of the last user message so likely follow-ups hit the semantic cache."""
+        user_indices = [i for i, m in enumerate(messages) if m.get("role") == "user"]
+        if not user_indices:
+            return
+        last = user_indices[-1]
+        semaphore = self._prefetch_semaphores.setdefault(asyncio.get_running_loop(), asyncio.Semaphore(2))
+        prompt = PARAPHRASE_PROMPT.format(n=self.prefetch_variants, text=messages[last]["content"])
+        try:
+            async with semaphore:
+                reply = await acompletion(
+                    **self._completion_params([{"role": "user", "content": prompt}], temperature=0.2)
+                )
+            content = reply.choices[0].message.content.strip()
+            if content.startswith("```"):
+                # Models often wrap JSON in a ```json fence despite the prompt
+                content = content.split("\n", 1)[-1].rsplit("```", 1)[0]
+            variants = orjson.loads(content)
+        except Exception:
+            # Prefetching is best effort; the original request has already been answered
+            return
+        if not isinstance(variants, list):
+            # A bare string would otherwise be sliced into single-character "paraphrases"
+            return
+
+        async def answer(variant: str) -> None:
+            variant_messages = [*messages[:last], {**messages[last], "content": variant}, *messages[last + 1 :]]
+            async with semaphore:
                 try:
-                    openai_response = openai.ChatCompletion.create(
-                        model=self.model, messages=messages, temperature=self.temperature, stream=stream, **kwargs
-                    )
-                    return openai_response
-                except Exception as e2:
-                    error_msg = f"LiteLLM failed: {str(e)}. OpenAI fallback also failed: {str(e2)}"
-                    raise RuntimeError(error_msg) from e2
-            else:
-                raise RuntimeError(f"LiteLLM failed for model {self.model}: {str(e)}") from e
-
-    def get_model_info(self) -> Dict[str, Any]:
+                    await self.achat_completion(variant_messages, prefetch=False, **kwargs)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(answer(v) for v in variants[: self.prefetch_variants] if isinstance(v, str)))
+
+    async def abatch(self, list_of_messages: List[List[Dict[str, str]]], **kwargs) -> List[Any]:
+        """Run several chat completions concurrently.
+
+        Args:
+            list_of_messages: One message list per completion request
+            **kwargs: Additional arguments to pass to each completion call
+
+        Returns:
+            The completion results, in the same order as ``list_of_messages``
+        """
+        return await asyncio.gather(*(self.achat_completion(m, **kwargs) for m in list_of_messages))
+
+    def batch_chat_completion(
+        self, list_of_messages: List[List[Dict[str, str]]], max_workers: int = 8, **kwargs
+    ) -> List[Any]:
+        """Run several chat completions in parallel worker threads.
+
+        All requests are submitted before any result is awaited, so N prompts take
+        roughly one round-trip instead of N.
+
+        Args:
+            list_of_messages: One message list per completion request
+            max_workers: Maximum number of concurrent requests
+            **kwargs: Additional arguments to pass to each completion call
+
+        Returns:
+            The completion results, in the same order as ``list_of_messages``
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.chat_completion, messages, **kwargs) for messages in list_of_messages]
+            return [future.result() for future in futures]
+
+    def batch_offline(
+        self, list_of_messages: List[List[Dict[str, str]]], poll_interval: float = 30, **kwargs
+    ) -> List[Any]:
+        """Run completions through the provider's asynchronous batch API.
+
+        Batch jobs are billed at a discount and are not subject to the synchronous rate
+        limits, but may take up to 24 hours to finish. Only OpenAI and Anthropic models
+        are supported.
+
+        Args:
+            list_of_messages: One message list per completion request
+            poll_interval: Seconds to wait between batch status checks
+            **kwargs: Additional arguments to include in each request body
+
+        Returns:
+            The response bodies as plain dicts (OpenAI ``chat.completion`` or Anthropic ``message``
+            JSON, depending on the provider), in the same order as ``list_of_messages``; None for
+            failed requests
+
+        Raises:
+            ValueError: If the model's provider has no supported batch API
+            RuntimeError: If the batch job does not complete
+        """
+        model, provider, _, _ = get_llm_provider(self.model)
+        if provider == "openai":
+            return self._batch_offline_openai(model, list_of_messages, poll_interval, **kwargs)
+        if provider == "anthropic":
+            return self._batch_offline_anthropic(model, list_of_messages, poll_interval, **kwargs)
+        raise ValueError(f"Batch API is not supported for provider {provider} (model {self.model})")
+
+    def _batch_offline_openai(
+        self, model: str, list_of_messages: List[List[Dict[str, str]]], poll_interval: float, **kwargs
+    ) -> List[Any]:
+        """Submit, poll and collect an OpenAI batch job."""
+        client = self._sync_openai_client()
+        rows = [
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": model, "messages": messages, "temperature": self.temperature, **kwargs},
+            }
+            for i, messages in enumerate(list_of_messages)
+        ]
+        data = b"\n".join(orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS) for row in rows)
+        batch_file = client.files.create(file=("batch.jsonl", data), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+
+        results: List[Any] = [None] * len(list_of_messages)
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).content.splitlines():
+                if not line:
+                    continue
+                item = orjson.loads(line)
+                if item.get("response"):
+                    results[int(item["custom_id"])] = item["response"]["body"]
+        return results
+
+    def _batch_offline_anthropic(
+        self, model: str, list_of_messages: List[List[Dict[str, str]]], poll_interval: float, **kwargs
+    ) -> List[Any]:
+        """Submit, poll and collect an Anthropic message batch."""
+        import anthropic  # type: ignore
+
+        client = anthropic.Anthropic(api_key=self.api_key)
+        requests = []
+        for i, messages in enumerate(list_of_messages):
+            # Anthropic takes the system prompt separately from the conversation
+            system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+            params = {
+                "model": model,
+                "max_tokens": 1024,
+                "temperature": self.temperature,
+                "messages": [m for m in messages if m["role"] != "system"],
+                **kwargs,
+            }
+            if system:
+                params["system"] = system
+            requests.append({"custom_id": str(i), "params": params})
+
+        batch = client.messages.batches.create(requests=requests)
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = client.messages.batches.retrieve(batch.id)
+
+        results: List[Any] = [None] * len(list_of_messages)
+        for entry in client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[int(entry.custom_id)] = entry.result.message.model_dump()
+        return results
+
+    def close(self) -> None:
+        """Close the pooled sync HTTP connections held by this client."""
+        self._http_client.close()
+
+    async def __aenter__(self) -> "LiteLLMClient":
+        """Enter an async context; the pools are closed again on exit."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the pooled connections of the running event loop."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for background prefetches, then close the pooled HTTP connections.
+
+        Prefetch tasks and the async pool belong to the running event loop, so this must be
+        awaited before the loop ends; pending prefetches are otherwise cancelled at loop exit
+        and the pool cannot be closed afterwards.
+        """
+        loop = asyncio.get_running_loop()
+        pending = [task for task in self._prefetch_tasks if task.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._http_client.close()
+        client = self._async_openai_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    def get_model_info(self) -> Mapping[str, Any]:
         """Get information about the current model.
 
+        The result is cached until the model or temperature is changed.
+
         Returns:
-            A dictionary containing model information
+            A read-only mapping containing model information
         """
-        return {
-            "model": self.model,
-            "api_base": self.api_base,
-            "temperature": self.temperature,
-            "timeout": self.timeout,
-            "max_retries": self.max_retries,
-            "kwargs": self.kwargs,
-        }
+        if self._model_info is None:
+            self._model_info = MappingProxyType(
+                {
+                    "model": self.model,
+                    "api_base": self.api_base,
+                    "temperature": self.temperature,
+                    "timeout": self.timeout,
+                    "max_retries": self.max_retries,
+                    "kwargs": self.kwargs,
+                }
+            )
+        return self._model_info
 
     def set_model(self, model: str) -> None:
         """Set a new model to use.
@@ -133,6 +746,7 @@ class LiteLLMClient:
             model: The name of the model to use (e.g., "gpt-3.5-turbo", "claude-instant-1")
         """
         self.model = model
+        self._model_info = None
 
     def set_temperature(self, temperature: float) -> None:
         """Set a new temperature value.
@@ -141,6 +755,7 @@ class LiteLLMClient:
             temperature: The new temperature value
         """
         self.temperature = temperature
+        self._model_info = None
 
 
 if __name__ == "__main__":
@@ -164,11 +779,11 @@ if __name__ == "__main__":
             print(f"Response: {response['choices'][0]['message']['content']}")
             if "cost" in response:
                 print(f"Cost: ${response['cost']:.6f}")
-        elif isinstance(response, list):
-            for chunk in response:
-                print(chunk.choices[0].delta.content or "", end="", flush=True)
+
+        # Stream a completion, printing tokens as they arrive
+        print_stream(client.stream_chat_completion(messages))
 
         # Get model info
-        print("\nModel Info:", client.get_model_info())
+        print("\nModel Info:", dict(client.get_model_info()))
 
     example_usage()
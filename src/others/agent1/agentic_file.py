@@ -3,9 +3,20 @@
 # computer using the new text_editor tool in the Anthropic API.
 
 import anthropic
+import asyncio
+import mmap
+import orjson
 import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from prompt_toolkit import PromptSession
+from prompt_toolkit.formatted_text import ANSI
 from termcolor import colored
 from dotenv import load_dotenv
 
@@ -41,16 +52,32 @@ IMPORTANT WORKFLOW:
 4. After making changes, summarize what you modified
 For sequential operations, make sure to complete one tool operation fully before starting another.
 """
+SUMMARY_PROMPT = "Summarize these tool interactions in at most 200 tokens. Keep file paths, edits made and open tasks."
+KEEP_RECENT_TURNS = 4  # User turns (with their tool exchanges) kept verbatim when older history is summarized
+MAX_BACKUPS_IN_MEMORY = 32  # Older backups are spilled to temp files
+
+
+def _remove_spilled_backups(spilled_backups: Dict[str, Tuple[int, str]]) -> None:
+    """Delete the temp files of spilled backups and forget them.
+
+    Args:
+        spilled_backups: Mapping of file path to (st_mtime_ns, temp file path).
+    """
+    for _, tmp_path in spilled_backups.values():
+        Path(tmp_path).unlink(missing_ok=True)
+    spilled_backups.clear()
 
 
 class ClaudeAgent:
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-7-sonnet-20250219", max_tokens: int = 4000):
+    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-7-sonnet-20250219", max_tokens: int = 4000,
+                 token_budget: int = 8000):
         """Initialize the Claude agent with API key and model.
 
         Args:
             api_key: Optional API key; if None, fetched from environment variable ANTHROPIC_API_KEY.
             model: The Anthropic model to use.
             max_tokens: Maximum tokens for Claude's responses.
+            token_budget: Approximate history size in tokens above which older turns are summarized.
         
         Raises:
             ValueError: If no API key is provided or found in the environment.
@@ -61,26 +88,59 @@ class ClaudeAgent:
         self.client = anthropic.Anthropic(api_key=self.api_key)
         self.model = model
         self.max_tokens = max_tokens
+        self.token_budget = token_budget
         self.conversation_history: List[Dict[str, Any]] = []
-        self.file_backups: Dict[str, str] = {}  # For undo functionality
+        # For undo functionality: path -> (st_mtime_ns when backed up, content), least recently used first
+        self.file_backups: OrderedDict[str, Tuple[int, bytes]] = OrderedDict()
+        self.spilled_backups: Dict[str, Tuple[int, str]] = {}  # path -> (st_mtime_ns, temp file path)
+        self._backup_lock = threading.Lock()  # Tool calls on different files run in parallel threads
+        # Spilled backups are copies of user files in the temp dir; remove them on close, GC or exit
+        self._backup_cleanup = weakref.finalize(self, _remove_spilled_backups, self.spilled_backups)
+        # Set when chat() is cancelled so the worker thread stops before its next request or tool call
+        self._cancelled = threading.Event()
         self.system_prompt = SYSTEM_PROMPT
-
-    def chat(self) -> None:
-        """Start an interactive chat session with Claude."""
+        # Static system prompt marked as a cache breakpoint so every turn reuses the cached prefix
+        self.system_blocks = [{"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}]
+        self._cached_block: Optional[Dict[str, Any]] = None  # Block carrying the rolling history breakpoint
+        # Request arguments shared by every turn, built once
+        self._create_kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": self.system_blocks,
+            "tools": [{"type": "text_editor_20250124", "name": "str_replace_editor"}],
+        }
+
+    async def chat(self) -> None:
+        """Start an interactive chat session with Claude.
+
+        Input is read with an async prompt and each message is processed in a worker
+        thread, so the event loop stays free for other tasks while either side waits.
+        A worker thread cannot be interrupted, so cancelling the session (e.g. Ctrl-C)
+        sets a flag that stops the tool loop before its next API request or tool call.
+        """
         if not self.api_key:
             print(colored("Error: API key is missing. Please set ANTHROPIC_API_KEY or pass api_key.", "red"))
             return
         print(colored("\n🤖 Claude Agent with Text Editor Tool", "cyan"))
         print(colored("Type 'exit' to quit, 'history' to see conversation history\n", "cyan"))
+        session = PromptSession()
         while True:
-            user_input = input(colored("You: ", "green"))
+            try:
+                user_input = await session.prompt_async(ANSI(colored("You: ", "green")))
+            except EOFError:
+                user_input = 'exit'
             if user_input.lower() == 'exit':
                 print(colored("\nGoodbye! 👋", "cyan"))
                 break
             if user_input.lower() == 'history':
                 self._print_history()
                 continue
-            final_response = self._process_message(user_input)
+            self._cancelled.clear()
+            try:
+                final_response = await asyncio.to_thread(self._process_message, user_input)
+            except asyncio.CancelledError:
+                self._cancelled.set()
+                raise
             if final_response:
                 self._print_assistant_response(final_response)
 
@@ -91,46 +151,116 @@ class ClaudeAgent:
             user_message: The message input from the user.
 
         Returns:
-            The final response from Claude, or None if an error occurs.
+            The final response from Claude, or None if an error occurs or the session is cancelled.
         """
         self.conversation_history.append({
             "role": "user",
             "content": [{"type": "text", "text": user_message}]
         })
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                system=self.system_prompt,
-                tools=[{"type": "text_editor_20250124", "name": "str_replace_editor"}],
-                messages=self.conversation_history
-            )
+            if self._cancelled.is_set():
+                return None
+            self._mark_cache_breakpoint()
+            response = self.client.messages.create(messages=self.conversation_history, **self._create_kwargs)
             self.conversation_history.append({"role": "assistant", "content": response.content})
             while response.stop_reason == "tool_use":
-                for content_item in response.content:
-                    if content_item.type == "tool_use":
-                        tool_result = self._handle_tool_use(content_item)
-                        self.conversation_history.append({
-                            "role": "user",
-                            "content": [{
-                                "type": "tool_result",
-                                "tool_use_id": content_item.id,
-                                "content": tool_result
-                            }]
-                        })
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    system=self.system_prompt,
-                    tools=[{"type": "text_editor_20250124", "name": "str_replace_editor"}],
-                    messages=self.conversation_history
-                )
+                tool_uses = [item for item in response.content if item.type == "tool_use"]
+                tool_results = self._handle_tool_uses(tool_uses)
+                self.conversation_history.append({
+                    "role": "user",
+                    "content": [{
+                        "type": "tool_result",
+                        "tool_use_id": tool_use.id,
+                        "content": tool_result
+                    } for tool_use, tool_result in zip(tool_uses, tool_results)]
+                })
+                if self._cancelled.is_set():
+                    return None
+                self._mark_cache_breakpoint()
+                response = self.client.messages.create(messages=self.conversation_history, **self._create_kwargs)
                 self.conversation_history.append({"role": "assistant", "content": response.content})
+            self._compact_history()
             return response
         except Exception as e:
             print(colored(f"\nError: {str(e)}", "red"))
             return None
 
+    def _mark_cache_breakpoint(self) -> None:
+        """Move the history cache breakpoint to the newest user message.
+
+        The whole conversation prefix up to that message is then served from the prompt
+        cache on the next request instead of being re-read at full input-token cost.
+        """
+        if self._cached_block is not None:
+            self._cached_block.pop("cache_control", None)
+        self._cached_block = self.conversation_history[-1]["content"][-1]
+        self._cached_block["cache_control"] = {"type": "ephemeral"}
+
+    def _compact_history(self) -> None:
+        """Summarize older turns once the history exceeds the token budget.
+
+        Everything before the last KEEP_RECENT_TURNS user turns is replaced by a single
+        request/summary pair, so the per-request input size stays bounded in long sessions.
+        """
+        # Rough estimate: ~4 characters per token
+        if len(orjson.dumps(self.conversation_history, default=str)) // 4 <= self.token_budget:
+            return
+        # A turn starts at a user text message; cutting there keeps each tool_use with its tool_result
+        turn_starts = [i for i, message in enumerate(self.conversation_history)
+                       if message["role"] == "user" and message["content"][0]["type"] == "text"]
+        if len(turn_starts) <= KEEP_RECENT_TURNS:
+            return
+        cut = turn_starts[-KEEP_RECENT_TURNS]
+        request = {"role": "user", "content": [{"type": "text", "text": SUMMARY_PROMPT}]}
+        try:
+            # The history holds tool_use/tool_result blocks, so the tool definitions must be sent too
+            summary = self.client.messages.create(
+                messages=self.conversation_history[:cut] + [request],
+                **{**self._create_kwargs, "max_tokens": 300, "tool_choice": {"type": "none"}}
+            )
+        except Exception as e:
+            print(colored(f"\nWarning: could not summarize history: {str(e)}", "yellow"))
+            return
+        if summary.stop_reason == "tool_use":
+            return
+        self.conversation_history[:cut] = [request, {"role": "assistant", "content": summary.content}]
+
+    def _handle_tool_uses(self, tool_uses: List[Any]) -> List[str]:
+        """Run all tool calls from one Claude turn, overlapping I/O on different files.
+
+        Calls are grouped by resolved file path: each group runs in order on its own worker
+        thread, so edits to the same file keep their sequence while independent
+        files are read and written concurrently.
+
+        Args:
+            tool_uses: The tool use requests from a single Claude response.
+
+        Returns:
+            The tool results, in the same order as ``tool_uses``.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, tool_use in enumerate(tool_uses):
+            # Resolve the path so spellings like ./a.py and a.py share one thread
+            groups.setdefault(os.path.realpath(tool_use.input.get('path', '')), []).append(i)
+        results: List[str] = [""] * len(tool_uses)
+
+        def run_group(indices: List[int]) -> None:
+            for i in indices:
+                # Every tool_use still needs a tool_result, so skipped calls report the cancellation
+                if self._cancelled.is_set():
+                    results[i] = "Error: Cancelled by user"
+                else:
+                    results[i] = self._handle_tool_use(tool_uses[i])
+
+        if len(groups) <= 1:
+            for indices in groups.values():
+                run_group(indices)
+            return results
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            for future in [executor.submit(run_group, indices) for indices in groups.values()]:
+                future.result()
+        return results
+
     def _handle_tool_use(self, tool_use: Dict[str, Any]) -> str:
         """Handle tool use requests from Claude using pattern matching.
 
@@ -183,13 +313,15 @@ class ClaudeAgent:
         if not path.exists():
             return f"Error: File not found: {file_path}"
         try:
-            with path.open('r', encoding='utf-8') as f:
-                lines = f.readlines()
+            lines = path.read_bytes().splitlines(keepends=True)
+            start = 0
             if view_range:
                 start = max(0, view_range[0] - 1)  # Convert to 0-indexed
                 end = view_range[1] if view_range[1] != -1 else len(lines)
                 lines = lines[start:end]
-            return ''.join(f"{i + (view_range[0] if view_range else 1)}: {line}" for i, line in enumerate(lines))
+            # Number and join the lines as bytes so the per-line loop stays in C
+            numbered = map(b"%d: %b".__mod__, zip(range(start + 1, start + 1 + len(lines)), lines))
+            return b''.join(numbered).decode('utf-8').replace('\r\n', '\n')
         except PermissionError:
             return f"Error: Permission denied when accessing {file_path}"
         except Exception as e:
@@ -234,22 +366,80 @@ class ClaudeAgent:
             return f"Error: File not found: {file_path}"
         try:
             self._backup_file(file_path)
-            with path.open('r', encoding='utf-8') as f:
-                content = f.read()
-            count = content.count(old_str)
-            if count == 0:
-                return f"Error: Text not found in {file_path}"
-            if count > 1:
-                return f"Error: Multiple matches ({count}) found in {file_path}"
-            new_content = content.replace(old_str, new_str, 1)
-            with path.open('w', encoding='utf-8') as f:
-                f.write(new_content)
+            old_b = old_str.encode('utf-8')
+            new_b = new_str.encode('utf-8')
+            target = path.resolve()  # Edit the file a symlink points to, not the link itself
+            tail = None
+            with target.open('rb') as f:
+                # mmap cannot map an empty file
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if target.stat().st_size else b''
+                try:
+                    first = content.find(old_b)
+                    if first == -1 and b"\n" in old_b and content.find(b"\r\n") != -1:
+                        # The model sees LF-only text; match and write back in the file's CRLF endings
+                        old_b = old_b.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+                        new_b = new_b.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+                        first = content.find(old_b)
+                    if first == -1:
+                        return f"Error: Text not found in {file_path}"
+                    # A second non-overlapping hit is enough to reject the edit
+                    if content.find(old_b, first + (len(old_b) or 1)) != -1:
+                        return f"Error: Multiple matches found in {file_path}"
+                    end = first + len(old_b)
+                    if target.stat().st_nlink > 1:
+                        tail = content[end:]
+                    else:
+                        # Zero-copy views of the mapped file; released before the mmap is closed
+                        with memoryview(content) as view:
+                            head, rest = view[:first], view[end:]
+                            try:
+                                self._write_atomically(target, (head, new_b, rest))
+                            finally:
+                                head.release()
+                                rest.release()
+                finally:
+                    if isinstance(content, mmap.mmap):
+                        content.close()
+            if tail is not None:
+                # Hard-linked files are rewritten in place so every link sees the edit
+                with target.open('r+b') as out:
+                    out.seek(first)
+                    out.write(new_b)
+                    out.write(tail)
+                    out.truncate()
             return "Successfully replaced text at exactly one location."
         except PermissionError:
             return f"Error: Permission denied when accessing {file_path}"
         except Exception as e:
             return f"Error replacing text: {str(e)}"
 
+    @staticmethod
+    def _write_atomically(target: Path, chunks: Tuple[Any, ...]) -> None:
+        """Write chunks to a temp file next to target and move it into place.
+
+        The temp file takes over target's permissions and, where allowed, its ownership.
+        It is removed again if anything fails before the final rename.
+
+        Args:
+            target: Resolved path of the file to overwrite.
+            chunks: Byte-like objects written in order.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            stat = target.stat()
+            shutil.copymode(target, tmp_path)
+            try:
+                os.chown(tmp_path, stat.st_uid, stat.st_gid)
+            except PermissionError:
+                pass
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
     def _insert_in_file(self, file_path: str, insert_line: int, new_str: str) -> str:
         """Insert text at a specific line in a file.
 
@@ -288,12 +478,16 @@ class ClaudeAgent:
         Returns:
             Success or error message.
         """
-        if file_path not in self.file_backups:
-            return f"Error: No backup found for {file_path}"
         try:
-            with Path(file_path).open('w', encoding='utf-8') as f:
-                f.write(self.file_backups[file_path])
-            del self.file_backups[file_path]
+            with self._backup_lock:
+                if file_path in self.file_backups:
+                    _, content = self.file_backups[file_path]
+                elif file_path in self.spilled_backups:
+                    content = Path(self.spilled_backups[file_path][1]).read_bytes()
+                else:
+                    return f"Error: No backup found for {file_path}"
+                Path(file_path).write_bytes(content)
+                self._drop_backup(file_path)
             return f"Successfully restored {file_path} to previous state."
         except PermissionError:
             return f"Error: Permission denied when accessing {file_path}"
@@ -303,15 +497,50 @@ class ClaudeAgent:
     def _backup_file(self, file_path: str) -> None:
         """Create a backup of a file before editing.
 
+        Backups are keyed by the file's modification time, so a backup is only
+        re-read when the file has changed since it was taken. At most
+        MAX_BACKUPS_IN_MEMORY backups are kept in memory; the least recently
+        used ones are spilled to temp files.
+
         Args:
             file_path: Path to the file to back up.
         """
-        if file_path not in self.file_backups:
-            try:
-                with Path(file_path).open('r', encoding='utf-8') as f:
-                    self.file_backups[file_path] = f.read()
-            except Exception:
-                pass
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+            with self._backup_lock:
+                if file_path in self.file_backups and self.file_backups[file_path][0] == mtime_ns:
+                    self.file_backups.move_to_end(file_path)
+                    return
+                if file_path in self.spilled_backups and self.spilled_backups[file_path][0] == mtime_ns:
+                    return
+            # Read outside the lock so backups of different files do not serialize
+            content = Path(file_path).read_bytes()
+            with self._backup_lock:
+                self._drop_backup(file_path)
+                self.file_backups[file_path] = (mtime_ns, content)
+                while len(self.file_backups) > MAX_BACKUPS_IN_MEMORY:
+                    old_path, (old_mtime_ns, old_content) = self.file_backups.popitem(last=False)
+                    with tempfile.NamedTemporaryFile(prefix="backup_", delete=False) as f:
+                        f.write(old_content)
+                    self.spilled_backups[old_path] = (old_mtime_ns, f.name)
+        except Exception:
+            pass
+
+    def _drop_backup(self, file_path: str) -> None:
+        """Forget any backup of a file, removing its temp file if it was spilled.
+
+        Args:
+            file_path: Path to the backed-up file.
+        """
+        self.file_backups.pop(file_path, None)
+        spilled = self.spilled_backups.pop(file_path, None)
+        if spilled:
+            Path(spilled[1]).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Remove the temp files holding spilled backups."""
+        with self._backup_lock:
+            self._backup_cleanup()
 
     def _print_assistant_response(self, response: Dict[str, Any]) -> None:
         """Print the assistant's response.
@@ -352,7 +581,8 @@ def main() -> None:
     try:
         load_dotenv()
         agent = ClaudeAgent()
-        agent.chat()
+        asyncio.run(agent.chat())
+        agent.close()
     except KeyboardInterrupt:
         print(colored("\nGoodbye! 👋", "cyan"))
     except Exception as e:
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("prompt_toolkit")
+
+from src.others.agent1 import agentic_file  # noqa: E402
+from src.others.agent1.agentic_file import ClaudeAgent  # noqa: E402
+
+
+@pytest.fixture
+def agent():
+    agent = ClaudeAgent(api_key="test-key")
+    yield agent
+    agent.close()
+
+
+def test_replace_text_not_found(agent, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("hello world\n")
+
+    assert agent._replace_in_file(str(path), "missing", "x").startswith("Error: Text not found")
+    assert path.read_text() == "hello world\n"
+
+
+def test_replace_multiple_matches(agent, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("foo\nfoo\n")
+
+    assert agent._replace_in_file(str(path), "foo", "bar").startswith("Error: Multiple matches found")
+    assert path.read_text() == "foo\nfoo\n"
+
+
+def test_replace_single_match(agent, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("one\ntwo\nthree\n")
+
+    assert agent._replace_in_file(str(path), "two", "2").startswith("Successfully")
+    assert path.read_text() == "one\n2\nthree\n"
+
+
+def test_replace_crlf_file(agent, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"one\r\ntwo\r\nthree\r\n")
+
+    assert agent._replace_in_file(str(path), "one\ntwo", "1\n2").startswith("Successfully")
+    assert path.read_bytes() == b"1\r\n2\r\nthree\r\n"
+
+
+def test_replace_through_symlink_edits_target(agent, tmp_path):
+    target = tmp_path / "target.txt"
+    target.write_text("old value\n")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+
+    assert agent._replace_in_file(str(link), "old", "new").startswith("Successfully")
+    assert link.is_symlink()
+    assert target.read_text() == "new value\n"
+
+
+def test_replace_keeps_hard_links(agent, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("old value\n")
+    other = tmp_path / "b.txt"
+    os.link(path, other)
+    inode = path.stat().st_ino
+
+    assert agent._replace_in_file(str(path), "old", "newer").startswith("Successfully")
+    assert path.stat().st_ino == inode
+    assert other.read_text() == "newer value\n"
+
+
+def test_undo_after_backup_is_spilled(agent, tmp_path, monkeypatch):
+    monkeypatch.setattr(agentic_file, "MAX_BACKUPS_IN_MEMORY", 1)
+    first = tmp_path / "first.txt"
+    first.write_text("first\n")
+    second = tmp_path / "second.txt"
+    second.write_text("second\n")
+
+    agent._replace_in_file(str(first), "first", "edited")
+    agent._replace_in_file(str(second), "second", "edited")
+
+    assert list(agent.file_backups) == [str(second)]
+    spilled = agent.spilled_backups[str(first)][1]
+    assert os.path.exists(spilled)
+
+    assert agent._undo_edit(str(first)).startswith("Successfully")
+    assert first.read_text() == "first\n"
+    assert str(first) not in agent.spilled_backups
+    assert not os.path.exists(spilled)
+
+
+def test_close_removes_spilled_backups(tmp_path, monkeypatch):
+    monkeypatch.setattr(agentic_file, "MAX_BACKUPS_IN_MEMORY", 0)
+    agent = ClaudeAgent(api_key="test-key")
+    path = tmp_path / "a.txt"
+    path.write_text("content\n")
+
+    agent._replace_in_file(str(path), "content", "edited")
+    spilled = agent.spilled_backups[str(path)][1]
+    agent.close()
+
+    assert not os.path.exists(spilled)
+    assert agent.spilled_backups == {}
@@ -0,0 +1,68 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("litellm")
+
+from src.lite_llm import LiteLLMClient, SemanticCache  # noqa: E402
+
+
+@pytest.fixture
+def make_cache(monkeypatch):
+    """Build SemanticCache instances without loading a real sentence-transformers model."""
+    stub = types.ModuleType("sentence_transformers")
+    stub.SentenceTransformer = lambda model_name: None
+    monkeypatch.setitem(sys.modules, "sentence_transformers", stub)
+    return SemanticCache
+
+
+def unit(*values):
+    emb = np.asarray(values, dtype=np.float32)
+    return emb / np.linalg.norm(emb)
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_similar_prompts_join_one_cluster(make_cache, quantize):
+    cache = make_cache(threshold=0.95, cluster_threshold=0.8, quantize=quantize)
+    a, b = unit(1, 0, 0), unit(1, 0.1, 0)
+    cache.add(a, "a")
+    cache.add(b, "b")
+    cache.add(unit(0, 0, 1), "c")
+
+    partition = cache.scopes[""]
+    assert [c["responses"] for c in partition["clusters"]] == [["a", "b"], ["c"]]
+    assert partition["centroids"].shape == (2, 3)
+    assert np.allclose(partition["centroids"][0], (a + b) / np.linalg.norm(a + b))
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_lookup_returns_closest_member_above_threshold(make_cache, quantize):
+    cache = make_cache(threshold=0.95, cluster_threshold=0.8, quantize=quantize)
+    cache.add(unit(1, 0, 0), "a")
+    cache.add(unit(1, 0.3, 0), "b")
+    cache.add(unit(0, 0, 1), "c")
+
+    assert cache.lookup(unit(1, 0.02, 0)) == "a"
+    assert cache.lookup(unit(1, 0.28, 0)) == "b"
+    assert cache.lookup(unit(0, 0.05, 1)) == "c"
+    assert cache.lookup(unit(0, 1, 0)) is None
+
+
+def test_lookup_is_scoped(make_cache):
+    cache = make_cache(threshold=0.95)
+    cache.add(unit(1, 0, 0), "a", scope="model-a")
+
+    assert cache.lookup(unit(1, 0, 0), scope="model-a") == "a"
+    assert cache.lookup(unit(1, 0, 0), scope="model-b") is None
+    assert cache.lookup(unit(1, 0, 0)) is None
+
+
+def test_cache_keys_accept_non_str_keys():
+    client = LiteLLMClient(temperature=0)
+    messages = [{"role": "user", "content": "hi"}]
+    scope = client._request_scope(logit_bias={50256: -100})
+
+    assert scope != client._request_scope(logit_bias={50256: 100})
+    assert client._exact_cache_key(messages, False, scope, logit_bias={50256: -100}) is not None